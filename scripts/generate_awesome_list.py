@@ -5,24 +5,98 @@ Uses Anthropic's Claude API to automatically categorize and describe starred rep
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import os
+import re
 import sys
-from datetime import datetime
-from typing import Dict, List, Optional
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import islice, pairwise
+from typing import Callable, Container, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+LLM_MODEL = "claude-3-5-haiku-20241022"
+LLM_MAX_TOKENS = 300
+# Seconds between Message Batches API status checks
+BATCH_POLL_INTERVAL = 10
+# Seconds to wait for batches before leaving them to be collected by the next run
+BATCH_MAX_WAIT = 20 * 60
+# Repo fields kept with a pending batch, enough to build its cache entries later
+BATCH_REPO_FIELDS = ("full_name", "html_url", "stargazers_count", "language", "description")
+# Maximum in-flight requests when categorizing with --llm-mode async
+ASYNC_CONCURRENCY = 20
+# Worker threads and request rate when categorizing with --llm-mode threads
+THREAD_WORKERS = 8
+LLM_RATE_LIMIT_RPM = 50
+LLM_MODES = ("batch", "async", "threads")
+# Parallel requests when fetching pages of GitHub stars
+GITHUB_FETCH_WORKERS = 8
+# Keep-alive connections kept open to api.github.com (at least GITHUB_FETCH_WORKERS)
+GITHUB_POOL_SIZE = 16
+# Write buffer for the generated README
+README_WRITE_BUFFER = 1 << 16
+# Turns a category name into its README anchor: spaces become dashes, "/" and "&" are dropped
+_ANCHOR_TABLE = str.maketrans({" ": "-", "/": None, "&": None})
+# Outermost {...} block of an LLM response, in case the JSON is wrapped in prose
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Called with (full_name, cache entry) as soon as each repo has been categorized
+ResultCallback = Optional[Callable[[str, Dict], None]]
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that need an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+class RateLimiter:
+    """Spaces out calls evenly so at most `rpm` start per minute, across threads."""
+
+    def __init__(self, rpm: int):
+        self.interval = 60.0 / rpm
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until the caller may issue its next request."""
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0.0, self.next_slot - now)
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay:
+            time.sleep(delay)
 
 
 class AwesomeListGenerator:
-    def __init__(self, dry_run: bool = False, limit: Optional[int] = None):
+    def __init__(self, dry_run: bool = False, limit: Optional[int] = None, llm_mode: str = "batch",
+                 top_per_category: Optional[int] = None):
         # Import dependencies here so --help works without them installed
         try:
+            import orjson
             import requests
             import yaml
-            from anthropic import Anthropic
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
             from dotenv import load_dotenv
+            self.orjson = orjson
             self.requests = requests
             self.yaml = yaml
-            self.Anthropic = Anthropic
             # Load .env file if it exists
             if os.path.exists("./.env"):
                 load_dotenv(".env")
@@ -35,33 +109,91 @@ class AwesomeListGenerator:
         self.github_username = os.environ.get("GITHUB_USERNAME")
         self.dry_run = dry_run
         self.limit = limit
+        self.llm_mode = llm_mode
+        self.top_per_category = top_per_category
         if not self.github_token:
             raise ValueError("GITHUB_TOKEN environment variable is required")
         if not self.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable is required")
 
-        self.anthropic = Anthropic(api_key=self.anthropic_api_key)
-        self.cache_file = ".cache"
+        # Anthropic clients are created on first use, see _ensure_anthropic()
+        self.anthropic = None
+        self.async_anthropic = None
+        self.rate_limiter = RateLimiter(LLM_RATE_LIMIT_RPM)
+
+        # One pooled, keep-alive session for all GitHub API calls
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"token {self.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        })
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=GITHUB_POOL_SIZE,
+            pool_maxsize=GITHUB_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        ))
+        self.cache_file = ".cache.jsonl"
+        # Pre-JSONL cache format (one JSON object), migrated on first load
+        self.legacy_cache_file = ".cache"
+        # Append handle for crash-safe incremental cache writes (opened in run())
+        self.cache_fp = None
+        # Per-page ETags of the starred repos listing, for conditional requests
+        self.etag_file = ".etags.json"
+        self.etags = {}
+        # Submitted Message Batches whose results have not been collected yet
+        self.pending_batches_file = ".pending-batches.json"
+        # Category -> full names sorted by stars, persisted between runs (see load_index())
+        self.index_file = ".category-index.json"
+        self.index = None
+        self.dirty_categories = set()
         self.categories_file = ".categories"
         self.readme_file = "README.md" if not dry_run else "README.dry-run.md"
 
+        # The instructions and category list are identical for every repo, so they are
+        # built once and marked for Anthropic prompt caching. Claude 3.5 Haiku only caches
+        # prompts of 2048+ tokens, so this only pays off for large category lists; the
+        # default .categories (~500 tokens) is sent uncached.
+        self.predefined_categories = self.load_categories()
+        self._system_block = [{
+            "type": "text",
+            "text": self._build_system_prompt(self.predefined_categories),
+            "cache_control": {"type": "ephemeral"}
+        }]
+        self._prompt_fn = self._build_prompt_fn(self.predefined_categories)
+
         if self.dry_run:
             print("🧪 DRY RUN MODE - No files will be modified")
             if self.limit:
                 print(f"   Limiting processing to {self.limit} new repos")
             print()
 
-    def fetch_github_stars(self) -> List[Dict]:
-        """Fetch all starred repositories from GitHub."""
-        print("Fetching GitHub stars...")
+    def _fetch_stars_page(self, url: str, page: int, etag: Optional[str] = None):
+        """Fetch a single page of starred repositories.
 
-        headers = {
-            "Authorization": f"token {self.github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        With an ETag from a previous run the request is conditional, and an
+        unchanged page comes back as an empty 304 response.
+        """
+        response = self.session.get(
+            url,
+            headers={"If-None-Match": etag} if etag else None,
+            params={"page": page, "per_page": 100}
+        )
+
+        if response.status_code not in (200, 304):
+            print(f"Error fetching stars: {response.status_code}")
+            print(f"Response: {response.text}")
+            sys.exit(1)
+
+        return response
+
+    def iter_github_stars(self) -> Iterator[List[Dict]]:
+        """Fetch starred repositories from GitHub, yielding one page at a time.
 
-        stars = []
-        page = 1
+        Pages that are unchanged since the last run (HTTP 304) are skipped, as
+        all of their repos are already in the cache with current star counts.
+        At most GITHUB_FETCH_WORKERS pages are held ahead of the consumer.
+        """
+        print("Fetching GitHub stars...")
 
         # If username is provided, use it; otherwise fetch authenticated user
         if self.github_username:
@@ -70,44 +202,175 @@ class AwesomeListGenerator:
             # Get authenticated user's starred repos
             url = "https://api.github.com/user/starred"
 
-        while True:
-            response = self.requests.get(
-                url,
-                headers=headers,
-                params={"page": page, "per_page": 100}
-            )
+        # ETags are only valid for the URL they were recorded for
+        old_etags = self.etags.get("pages", {}) if self.etags.get("url") == url else {}
+        new_etags = {}
+        unchanged_pages = 0
+        total_stars = 0
+
+        def collect(page: int, response) -> List[Dict]:
+            nonlocal unchanged_pages, total_stars
+            if response.status_code == 304:
+                new_etags[str(page)] = old_etags[str(page)]
+                unchanged_pages += 1
+                print(f"Page {page} unchanged")
+                return []
+            if response.headers.get("ETag"):
+                new_etags[str(page)] = response.headers["ETag"]
+            page_stars = response.json()
+            total_stars += len(page_stars)
+            print(f"Fetched page {page} ({len(page_stars)} repos)")
+            return page_stars
+
+        # The first page tells us how many pages there are (Link: rel="last")
+        first = self._fetch_stars_page(url, 1, old_etags.get("1"))
+        yield collect(1, first)
+
+        if first.status_code == 304:
+            # An unchanged first page means the page count is unchanged too
+            last_page = self.etags.get("last_page", 1)
+        elif "last" in first.links:
+            query = parse_qs(urlparse(first.links["last"]["url"]).query)
+            last_page = int(query["page"][0])
+        else:
+            last_page = 1
+
+        def fetch(page: int):
+            return page, executor.submit(self._fetch_stars_page, url, page, old_etags.get(str(page)))
+
+        # Fetch the remaining pages concurrently, keeping a bounded window in flight
+        with ThreadPoolExecutor(max_workers=GITHUB_FETCH_WORKERS) as executor:
+            remaining = iter(range(2, last_page + 1))
+            in_flight = deque(fetch(page) for page in islice(remaining, GITHUB_FETCH_WORKERS))
+            while in_flight:
+                page, future = in_flight.popleft()
+                next_page = next(remaining, None)
+                if next_page is not None:
+                    in_flight.append(fetch(next_page))
+                yield collect(page, future.result())
+
+        self.etags = {"url": url, "last_page": last_page, "pages": new_etags}
+
+        if unchanged_pages:
+            print(f"Total stars fetched: {total_stars} ({unchanged_pages} unchanged pages skipped)")
+        else:
+            print(f"Total stars fetched: {total_stars}")
 
-            if response.status_code != 200:
-                print(f"Error fetching stars: {response.status_code}")
-                print(f"Response: {response.text}")
-                sys.exit(1)
+    def _cache_fingerprint(self, cache: Dict) -> str:
+        """Hash of the cached repo names, to tell whether ETags still match the cache."""
+        digest = hashlib.sha256()
+        for repo_full_name in sorted(cache):
+            digest.update(repo_full_name.encode() + b"\n")
+        return digest.hexdigest()
 
-            page_stars = response.json()
-            if not page_stars:
-                break
+    def load_etags(self, cache: Dict) -> Dict:
+        """Load the per-page ETags recorded by the previous run.
 
-            stars.extend(page_stars)
-            print(f"Fetched page {page} ({len(page_stars)} repos)")
-            page += 1
+        They are only usable if the cache still holds exactly the repos it held
+        when they were saved: a 304 page is skipped on the assumption that all of
+        its repos are cached, so a repo removed from the cache would never return.
+        """
+        if not os.path.exists(self.etag_file):
+            return {}
+
+        with open(self.etag_file, 'rb') as f:
+            etags = self.orjson.loads(f.read())
+        if etags.get("cache_fingerprint") != self._cache_fingerprint(cache):
+            print(f"Cache changed since {self.etag_file} was written, fetching all pages")
+            return {}
+        return etags
+
+    def save_etags(self, cache: Dict):
+        """Save the per-page ETags for the next run, tied to the current cache contents."""
+        if self.dry_run:
+            print(f"[DRY RUN] Would save ETags for {len(self.etags.get('pages', {}))} pages to {self.etag_file}")
+            return
 
-        print(f"Total stars fetched: {len(stars)}")
-        return stars
+        etags = {**self.etags, "cache_fingerprint": self._cache_fingerprint(cache)}
+        with open(self.etag_file, 'wb') as f:
+            f.write(self.orjson.dumps(etags, option=self.orjson.OPT_INDENT_2) + b"\n")
 
     def load_cache(self) -> Dict:
-        """Load the cache of already processed stars."""
+        """Load the cache of already processed stars.
+
+        The cache is JSON Lines, one {"key": full_name, ...entry} object per line.
+        Later lines win, so entries appended during a run override older ones.
+        """
         if os.path.exists(self.cache_file):
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
+            cache = {}
+            with open(self.cache_file, 'rb') as f:
+                for line_no, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = self.orjson.loads(line)
+                    except self.orjson.JSONDecodeError:
+                        # Most likely a line truncated by a crash mid-write
+                        print(f"⚠ Skipping unreadable line {line_no} in {self.cache_file}")
+                        continue
+                    if "key" in entry:
+                        cache[entry.pop("key")] = entry
+            return cache
+
+        if os.path.exists(self.legacy_cache_file):
+            cache = self._load_legacy_cache()
+            print(f"Migrating {self.legacy_cache_file} to {self.cache_file}")
+            self.save_cache(cache)
+            return cache
+
         return {}
 
+    def _load_legacy_cache(self) -> Dict:
+        """Read a pre-JSONL cache file (one big JSON object).
+
+        Uses ijson, when installed, to stream entries into the dict without
+        holding the raw file and the parsed tree in memory at the same time.
+        """
+        try:
+            import ijson
+        except ImportError:
+            with open(self.legacy_cache_file, 'r') as f:
+                return json.load(f)
+
+        with open(self.legacy_cache_file, 'rb') as f:
+            return dict(ijson.kvitems(f, '', use_float=True))
+
+    def _open_cache_for_append(self):
+        """Open the cache file for the per-entry appends of this run."""
+        # Flushed after every entry so each categorized repo hits the disk immediately
+        self.cache_fp = open(self.cache_file, 'ab')
+        if self.cache_fp.tell() == 0:
+            return
+        # A crash mid-write can leave a partial last line; start a fresh line so the
+        # first entry of this run isn't glued onto it and lost with it
+        with open(self.cache_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                self.cache_fp.write(b"\n")
+                self.cache_fp.flush()
+
+    def _append_cache_entry(self, repo_full_name: str, entry: Dict):
+        """Append a single entry to the cache file so it survives a crash."""
+        if self.cache_fp is None:
+            return
+        self.cache_fp.write(self.orjson.dumps({"key": repo_full_name, **entry}) + b"\n")
+        self.cache_fp.flush()
+
     def save_cache(self, cache: Dict):
-        """Save the cache to disk."""
+        """Rewrite the cache to disk, compacting entries appended during the run."""
         if self.dry_run:
             print(f"[DRY RUN] Would save cache with {len(cache)} entries to {self.cache_file}")
             return
 
-        with open(self.cache_file, 'w') as f:
-            json.dump(cache, f, indent=2)
+        if self.cache_fp is not None:
+            self.cache_fp.close()
+            self.cache_fp = None
+
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            for repo_full_name, entry in cache.items():
+                f.write(self.orjson.dumps({"key": repo_full_name, **entry}) + b"\n")
+        os.replace(tmp_file, self.cache_file)
 
     def load_categories(self) -> Optional[Dict]:
         """Load predefined categories if available."""
@@ -116,14 +379,8 @@ class AwesomeListGenerator:
                 return self.yaml.safe_load(f)
         return None
 
-    def categorize_with_llm(self, repo: Dict, predefined_categories: Optional[Dict] = None) -> Dict:
-        """Use Claude API to categorize and describe a repository."""
-        repo_name = repo["full_name"]
-        description = repo.get("description", "No description provided")
-        topics = ", ".join(repo.get("topics", []))
-        language = repo.get("language", "Unknown")
-        stars = repo.get("stargazers_count", 0)
-
+    def _build_system_prompt(self, predefined_categories: Optional[Dict] = None) -> str:
+        """Build the static instructions shared by every categorization request."""
         # Build the prompt with strict category enforcement
         if predefined_categories and "categories" in predefined_categories:
             # Build detailed category list with descriptions
@@ -135,14 +392,7 @@ class AwesomeListGenerator:
 
             categories_text = "\n".join(category_details)
 
-            prompt = f"""Analyze this GitHub repository and categorize it.
-
-Repository Information:
-- Name: {repo_name}
-- Description: {description}
-- Topics: {topics}
-- Language: {language}
-- Stars: {stars}
+            return f"""You categorize GitHub repositories for a curated awesome list.
 
 IMPORTANT: You MUST choose EXACTLY ONE category from this list. Do NOT create new categories.
 
@@ -157,84 +407,385 @@ Respond ONLY with valid JSON in this exact format:
 {{"category": "Category Name", "description": "Your concise description here."}}
 
 Remember: Use the EXACT category name from the list above."""
-        else:
-            # Fallback if no categories file exists
-            prompt = f"""Analyze this GitHub repository and provide:
+
+        # Fallback if no categories file exists
+        return """For each GitHub repository you are given, provide:
 1. A category name (e.g., "Web Development", "Machine Learning", "DevOps", etc.)
 2. A concise 1-2 sentence description that explains what the repository does and why it's useful
 
-Repository: {repo_name}
+Respond ONLY with valid JSON in this exact format:
+{"category": "Category Name", "description": "Your concise description here."}"""
+
+    def _build_prompt_fn(self, predefined_categories: Optional[Dict] = None):
+        """Pick the per-repository prompt template once, instead of branching on every call."""
+        if predefined_categories and "categories" in predefined_categories:
+            return lambda repo_name, description, topics, language, stars: f"""Analyze this GitHub repository and categorize it.
+
+Repository Information:
+- Name: {repo_name}
+- Description: {description}
+- Topics: {topics}
+- Language: {language}
+- Stars: {stars}"""
+
+        return lambda repo_name, description, topics, language, stars: f"""Repository: {repo_name}
 Description: {description}
 Topics: {topics}
 Language: {language}
-Stars: {stars}
+Stars: {stars}"""
+
+    def _build_prompt(self, repo: Dict) -> str:
+        """Build the per-repository part of the categorization prompt."""
+        return self._prompt_fn(
+            repo["full_name"],
+            repo.get("description", "No description provided"),
+            ", ".join(repo.get("topics", [])),
+            repo.get("language", "Unknown"),
+            repo.get("stargazers_count", 0)
+        )
+
+    def _message_params(self, repo: Dict) -> Dict:
+        """Build the Messages API parameters for a single repository."""
+        return {
+            "model": LLM_MODEL,
+            "max_tokens": LLM_MAX_TOKENS,
+            "system": self._system_block,
+            "messages": [
+                {"role": "user", "content": self._build_prompt(repo)}
+            ]
+        }
 
-Respond ONLY with valid JSON in this exact format:
-{{"category": "Category Name", "description": "Your concise description here."}}"""
+    def _parse_llm_response(self, repo: Dict, response_text: str, processed_at: str) -> Dict:
+        """Turn a raw LLM response into a cache entry."""
+        match = _JSON_RE.search(response_text)
+        result = self.orjson.loads(match.group(0) if match else response_text.strip())
+
+        return {
+            "category": result["category"],
+            "description": result["description"],
+            "url": repo["html_url"],
+            "stars": repo.get("stargazers_count", 0),
+            "language": repo.get("language", "Unknown"),
+            "processed_at": processed_at
+        }
+
+    def _fallback_entry(self, repo: Dict, processed_at: str) -> Dict:
+        """Basic cache entry used when the LLM call fails."""
+        language = repo.get("language", "Unknown")
+        return {
+            "category": language if language else "Other",
+            "description": repo.get("description", "No description provided") or "Interesting repository",
+            "url": repo["html_url"],
+            "stars": repo.get("stargazers_count", 0),
+            "language": language,
+            "processed_at": processed_at
+        }
 
+    def _ensure_anthropic(self):
+        """Create the Anthropic clients on first use.
+
+        The SDK is slow to import, and runs without new stars never need it.
+        """
+        if self.anthropic is not None:
+            return
+        try:
+            from anthropic import Anthropic, AsyncAnthropic
+        except ImportError as e:
+            print(f"❌ Missing required dependency: {e}")
+            print("Install dependencies with: pip install -r requirements.txt")
+            sys.exit(1)
+        self.anthropic = Anthropic(api_key=self.anthropic_api_key)
+        self.async_anthropic = AsyncAnthropic(api_key=self.anthropic_api_key)
+
+    def categorize_with_llm(self, repo: Dict, processed_at: Optional[str] = None) -> Dict:
+        """Use Claude API to categorize and describe a repository."""
+        processed_at = processed_at or _utc_now_iso()
+        self._ensure_anthropic()
         try:
+            self.rate_limiter.wait()
             message = self.anthropic.messages.create(
-                model="claude-3-5-haiku-20241022",
-                max_tokens=300,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+                **self._message_params(repo)
             )
+            return self._parse_llm_response(repo, message.content[0].text, processed_at)
 
-            response_text = message.content[0].text.strip()
-
-            # Parse JSON response
-            result = json.loads(response_text)
+        except Exception as e:
+            print(f"Error processing {repo['full_name']}: {e}")
+            # Fallback to basic categorization
+            return self._fallback_entry(repo, processed_at)
 
-            return {
-                "category": result["category"],
-                "description": result["description"],
-                "url": repo["html_url"],
-                "stars": stars,
-                "language": language,
-                "processed_at": datetime.utcnow().isoformat()
-            }
+    async def _categorize_one(self, repo: Dict, sem: asyncio.Semaphore, processed_at: str) -> Dict:
+        """Async counterpart of categorize_with_llm, bounded by a shared semaphore."""
+        try:
+            async with sem:
+                message = await self.async_anthropic.messages.create(
+                    **self._message_params(repo)
+                )
+            return self._parse_llm_response(repo, message.content[0].text, processed_at)
 
         except Exception as e:
-            print(f"Error processing {repo_name}: {e}")
+            print(f"Error processing {repo['full_name']}: {e}")
             # Fallback to basic categorization
-            return {
-                "category": language if language else "Other",
-                "description": description or "Interesting repository",
-                "url": repo["html_url"],
-                "stars": stars,
-                "language": language,
-                "processed_at": datetime.utcnow().isoformat()
-            }
-
-    def process_new_stars(self, stars: List[Dict], cache: Dict, predefined_categories: Optional[Dict] = None) -> Dict:
-        """Process only new stars that aren't in the cache."""
-        new_count = 0
-        updated_count = 0
-        processed_new = 0
+            return self._fallback_entry(repo, processed_at)
 
-        for repo in stars:
-            repo_full_name = repo["full_name"]
+    async def _categorize_all(self, repos: Iterable[Dict], processed_at: str,
+                              on_result: ResultCallback = None) -> List:
+        """Fan out one request per repo as soon as it comes out of `repos`.
 
-            # Check if repo is already in cache
-            if repo_full_name in cache:
-                # Update star count if changed
-                if cache[repo_full_name]["stars"] != repo["stargazers_count"]:
-                    cache[repo_full_name]["stars"] = repo["stargazers_count"]
-                    updated_count += 1
+        `repos` may be a lazy iterator that blocks on GitHub, so it is advanced
+        in a worker thread and categorization overlaps with fetching.
+        Returns (repo, result) pairs; failures come back as exceptions, not raised.
+        """
+        sem = asyncio.Semaphore(ASYNC_CONCURRENCY)
+
+        async def categorize_and_report(repo: Dict) -> Dict:
+            result = await self._categorize_one(repo, sem, processed_at)
+            if on_result:
+                on_result(repo["full_name"], result)
+            return result
+
+        repos = iter(repos)
+        exhausted = object()
+        started = []
+        while (repo := await asyncio.to_thread(next, repos, exhausted)) is not exhausted:
+            self._ensure_anthropic()
+            started.append((repo, asyncio.create_task(categorize_and_report(repo))))
+
+        results = await asyncio.gather(*(task for _, task in started), return_exceptions=True)
+        return [(repo, result) for (repo, _), result in zip(started, results)]
+
+    def categorize_concurrently(self, repos: Iterable[Dict], processed_at: Optional[str] = None,
+                                on_result: ResultCallback = None) -> Dict[str, Dict]:
+        """Categorize many repositories with concurrent Messages API calls.
+
+        Lower latency than the batch API for small incremental runs.
+        `on_result` is called for each repo as soon as its call completes.
+        Returns a dict mapping each repo's full name to its cache entry.
+        """
+        processed_at = processed_at or _utc_now_iso()
+        results = asyncio.run(self._categorize_all(repos, processed_at, on_result))
+
+        entries = {}
+        for repo, result in results:
+            if isinstance(result, BaseException):
+                print(f"Error processing {repo['full_name']}: {result}")
+                result = self._fallback_entry(repo, processed_at)
+                if on_result:
+                    on_result(repo["full_name"], result)
+            entries[repo["full_name"]] = result
+        return entries
+
+    def categorize_threaded(self, repos: Iterable[Dict], processed_at: Optional[str] = None,
+                            on_result: ResultCallback = None) -> Dict[str, Dict]:
+        """Categorize many repositories with the sync client on a thread pool.
+
+        Repos are submitted as soon as they come out of `repos`, and calls are
+        paced by the shared rate limiter to stay clear of 429s. `on_result` is
+        called from the worker thread as soon as each repo is done.
+        Returns a dict mapping each repo's full name to its cache entry.
+        """
+        processed_at = processed_at or _utc_now_iso()
+
+        def categorize_and_report(repo: Dict) -> Dict:
+            result = self.categorize_with_llm(repo, processed_at)
+            if on_result:
+                on_result(repo["full_name"], result)
+            return result
+
+        entries = {}
+        with ThreadPoolExecutor(max_workers=THREAD_WORKERS) as pool:
+            futures = {}
+            for repo in repos:
+                self._ensure_anthropic()
+                futures[pool.submit(categorize_and_report, repo)] = repo
+            for done, future in enumerate(as_completed(futures), start=1):
+                repo = futures[future]
+                entries[repo["full_name"]] = future.result()
+                print(f"  [{done}/{len(futures)}] Categorized {repo['full_name']}")
+        return entries
+
+    def categorize_batch(self, repos: List[Dict], processed_at: Optional[str] = None,
+                         on_result: ResultCallback = None, cached: Container[str] = ()) -> Dict[str, Dict]:
+        """Categorize many repositories with the Message Batches API.
+
+        Every submitted batch is recorded in the pending batches file right away.
+        Batches left over from an earlier run are collected instead of resubmitting
+        their repos, and polling gives up after BATCH_MAX_WAIT, leaving whatever is
+        still processing for the next run. `on_result` is called for each repo
+        as its result is read from a finished batch. Leftover batches may cover repos
+        that another run (e.g. --llm-mode async) has categorized since; their results
+        are dropped for any repo in `cached` rather than overwriting newer entries.
+        Returns a dict mapping each collected repo's full name to its cache entry.
+        """
+        processed_at = processed_at or _utc_now_iso()
+        pending = self.load_pending_batches()
+        in_flight = {repo["full_name"] for batch in pending for repo in batch["repos"].values()}
+        to_submit = {repo["full_name"]: repo for repo in repos if repo["full_name"] not in in_flight}
+        if pending:
+            print(f"Resuming {len(pending)} pending batch(es) with {len(in_flight)} repos")
+        if not pending and not to_submit:
+            return {}
+
+        self._ensure_anthropic()
+        if to_submit:
+            # Batch custom_ids only allow [a-zA-Z0-9_-], so "owner/repo" names are mapped to indices
+            batch_repos = {f"repo-{index}": repo for index, repo in enumerate(to_submit.values())}
+            batch = self.anthropic.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": self._message_params(repo)}
+                    for custom_id, repo in batch_repos.items()
+                ]
+            )
+            print(f"Submitted batch {batch.id} with {len(batch_repos)} repos")
+            pending.append({
+                "id": batch.id,
+                "processed_at": processed_at,
+                "repos": {
+                    custom_id: {field: repo.get(field) for field in BATCH_REPO_FIELDS}
+                    for custom_id, repo in batch_repos.items()
+                }
+            })
+            self.save_pending_batches(pending)
+
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        results = {}
+        for entry in list(pending):
+            batch = self._wait_for_batch(entry["id"], deadline)
+            if batch.processing_status != "ended":
+                print(f"Batch {batch.id} is still {batch.processing_status}; its {len(entry['repos'])} "
+                      f"repos will be collected on the next run")
                 continue
-
-            # Check if we've hit the limit in dry run mode
-            if self.dry_run and self.limit and processed_new >= self.limit:
-                new_count += 1  # Count it but don't process
+            results.update(self._collect_batch(entry, on_result, cached))
+            pending.remove(entry)
+            self.save_pending_batches(pending)
+
+        return results
+
+    def _wait_for_batch(self, batch_id: str, deadline: float):
+        """Poll a batch until it has ended or the deadline (time.monotonic()) passes."""
+        batch = self.anthropic.messages.batches.retrieve(batch_id)
+        while batch.processing_status != "ended" and time.monotonic() < deadline:
+            time.sleep(min(BATCH_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+            batch = self.anthropic.messages.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            print(f"  Batch {batch.processing_status}: {counts.succeeded} succeeded, "
+                  f"{counts.errored} errored, {counts.processing} processing")
+        return batch
+
+    def _collect_batch(self, entry: Dict, on_result: ResultCallback = None,
+                       cached: Container[str] = ()) -> Dict[str, Dict]:
+        """Turn the results of an ended batch into cache entries, skipping repos in `cached`."""
+        repos = entry["repos"]
+        processed_at = entry["processed_at"]
+        stale = {repo["full_name"] for repo in repos.values() if repo["full_name"] in cached}
+        if stale:
+            print(f"Ignoring batch {entry['id']} results for {len(stale)} repos already in the cache")
+        results = {}
+        for item in self.anthropic.messages.batches.results(entry["id"]):
+            repo = repos[item.custom_id]
+            if repo["full_name"] in stale:
                 continue
+            try:
+                if item.result.type != "succeeded":
+                    raise RuntimeError(f"batch request {item.result.type}")
+                results[repo["full_name"]] = self._parse_llm_response(
+                    repo, item.result.message.content[0].text, processed_at
+                )
+            except Exception as e:
+                print(f"Error processing {repo['full_name']}: {e}")
+                results[repo["full_name"]] = self._fallback_entry(repo, processed_at)
+            if on_result:
+                on_result(repo["full_name"], results[repo["full_name"]])
+
+        # Requests missing from the results (e.g. batch cancelled) still get an entry
+        for repo in repos.values():
+            if repo["full_name"] not in results and repo["full_name"] not in stale:
+                print(f"Error processing {repo['full_name']}: no batch result")
+                results[repo["full_name"]] = self._fallback_entry(repo, processed_at)
+                if on_result:
+                    on_result(repo["full_name"], results[repo["full_name"]])
+
+        return results
+
+    def load_pending_batches(self) -> List[Dict]:
+        """Load the batches submitted by earlier runs whose results were not collected yet."""
+        if os.path.exists(self.pending_batches_file):
+            with open(self.pending_batches_file, 'rb') as f:
+                return self.orjson.loads(f.read())
+        return []
+
+    def save_pending_batches(self, pending: List[Dict]):
+        """Save the batches whose results still have to be collected."""
+        if self.dry_run:
+            return
+
+        with open(self.pending_batches_file, 'wb') as f:
+            f.write(self.orjson.dumps(pending, option=self.orjson.OPT_INDENT_2) + b"\n")
 
-            # New star - process it
-            print(f"Processing new star: {repo_full_name}")
-            result = self.categorize_with_llm(repo, predefined_categories)
-            cache[repo_full_name] = result
-            new_count += 1
-            processed_new += 1
+    def process_new_stars(self, star_pages: Iterable[List[Dict]], cache: Dict) -> Dict:
+        """Process only new stars that aren't in the cache.
+
+        `star_pages` is consumed page by page, so with --llm-mode async/threads
+        new repos are sent to Claude while later pages are still being fetched.
+        """
+        # Snapshot of cached star counts, so unchanged repos cost a single dict lookup
+        existing_stars = {name: entry["stars"] for name, entry in cache.items()}
+        seen_new = set()
+        new_count = 0
+        processed_new = 0
+        updated_count = 0
+
+        def iter_new_repos() -> Iterator[Dict]:
+            nonlocal new_count, processed_new, updated_count
+            for page in star_pages:
+                for repo in page:
+                    repo_full_name = repo["full_name"]
+                    star_count = repo["stargazers_count"]
+
+                    # Update star counts of already cached repos
+                    if repo_full_name in existing_stars:
+                        if existing_stars[repo_full_name] != star_count:
+                            cache[repo_full_name]["stars"] = star_count
+                            self.dirty_categories.add(cache[repo_full_name]["category"])
+                            existing_stars[repo_full_name] = star_count
+                            updated_count += 1
+                        continue
+
+                    # Skip duplicates, in case a repo shifted between pages while fetching
+                    if repo_full_name in seen_new:
+                        continue
+                    seen_new.add(repo_full_name)
+                    new_count += 1
+
+                    # Check if we've hit the limit in dry run mode
+                    if self.dry_run and self.limit and processed_new >= self.limit:
+                        continue  # Count it but don't process
+
+                    print(f"Processing new star: {repo_full_name}")
+                    processed_new += 1
+                    yield repo
+
+        # Results are stored the moment each repo is done, so a crash keeps them.
+        # The threads mode reports from worker threads, hence the lock.
+        store_lock = threading.Lock()
+
+        def store_result(repo_full_name: str, result: Dict):
+            with store_lock:
+                previous = cache.get(repo_full_name)
+                cache[repo_full_name] = result
+                self._append_cache_entry(repo_full_name, result)
+                self._index_add(repo_full_name, result["category"],
+                                previous["category"] if previous else None)
+
+        # New stars - categorize them as they arrive (Anthropic is never loaded without any)
+        # One timestamp for the whole run rather than one per repo
+        processed_at = _utc_now_iso()
+        if self.llm_mode == "async":
+            self.categorize_concurrently(iter_new_repos(), processed_at, store_result)
+        elif self.llm_mode == "threads":
+            self.categorize_threaded(iter_new_repos(), processed_at, store_result)
+        else:
+            # A batch is submitted once, so every page has to be fetched first
+            self.categorize_batch(list(iter_new_repos()), processed_at, store_result, cached=cache)
 
         if self.dry_run and self.limit and new_count > processed_new:
             print(f"\n[DRY RUN] Processed {processed_new} of {new_count} new stars (limit: {self.limit})")
@@ -244,6 +795,72 @@ Respond ONLY with valid JSON in this exact format:
 
         return cache
 
+    def load_index(self, cache: Dict):
+        """Load the category index, rebuilding it if it no longer matches the cache.
+
+        The index maps each category to its repos' full names, sorted by stars,
+        so a run only has to re-sort the categories it touched.
+        """
+        index = None
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'rb') as f:
+                index = self.orjson.loads(f.read())
+
+        if index is not None and sum(map(len, index.values())) == len(cache) and all(
+            name in cache and cache[name]["category"] == category
+            for category, names in index.items()
+            for name in names
+        ):
+            self.index = index
+            # The cache may have been saved with new star counts while the index was not
+            # (e.g. a crash before the README step), so re-sort any category out of order
+            self.dirty_categories.update(
+                category for category, names in index.items()
+                if any(cache[higher]["stars"] < cache[lower]["stars"] for higher, lower in pairwise(names))
+            )
+            return
+
+        # Missing or stale: group the whole cache again and sort every category
+        index = defaultdict(list)
+        for repo_name, data in cache.items():
+            index[data["category"]].append(repo_name)
+        self.index = dict(index)
+        self.dirty_categories = set(self.index)
+
+    def save_index(self):
+        """Save the category index for the next run."""
+        if self.dry_run:
+            print(f"[DRY RUN] Would save category index to {self.index_file}")
+            return
+
+        with open(self.index_file, 'wb') as f:
+            f.write(self.orjson.dumps(self.index, option=self.orjson.OPT_INDENT_2) + b"\n")
+
+    def _index_add(self, repo_full_name: str, category: str, previous_category: Optional[str] = None):
+        """Add a (re)categorized repo to the category index.
+
+        Safe to call again for the same repo: it is moved out of `previous_category`
+        and never listed twice in `category`.
+        """
+        if self.index is None:
+            return
+        if previous_category is not None and previous_category != category:
+            previous_names = self.index.get(previous_category, [])
+            if repo_full_name in previous_names:
+                previous_names.remove(repo_full_name)
+        names = self.index.setdefault(category, [])
+        if repo_full_name not in names:
+            names.append(repo_full_name)
+        # Even when it was already listed, its star count may have changed
+        self.dirty_categories.add(category)
+
+    def _readme_line(self, repo_full_name: str, data: Dict) -> str:
+        """Format a single repository as a README list item."""
+        repo_name = repo_full_name.split("/", 1)[1]  # Get just the repo name, not owner/repo
+        language = f" `{data['language']}`" if data.get('language') else ""
+        stars = f"⭐ {data['stars']}" if data['stars'] > 0 else ""
+        return f"- **[{repo_name}]({data['url']})** - {data['description']}{language} {stars}\n"
+
     def generate_readme(self, cache: Dict):
         """Generate the README.md awesome list."""
         if self.dry_run:
@@ -251,53 +868,43 @@ Respond ONLY with valid JSON in this exact format:
         else:
             print("\nGenerating README.md...")
 
-        # Organize by category
-        categories = {}
-        for repo_name, data in cache.items():
-            category = data["category"]
-            if category not in categories:
-                categories[category] = []
-            categories[category].append({
-                "name": repo_name,
-                "url": data["url"],
-                "description": data["description"],
-                "stars": data["stars"],
-                "language": data.get("language", "")
-            })
+        if self.index is None:
+            self.load_index(cache)
 
-        # Sort categories alphabetically and repos by stars within each category
+        # Only categories that gained repos or changed star counts need re-sorting
+        for category in self.dirty_categories:
+            self.index[category].sort(key=lambda name: cache[name]["stars"], reverse=True)
+        self.dirty_categories = set()
+
+        # Sort categories alphabetically; repos are already sorted by stars within each category
+        categories = {category: names for category, names in self.index.items() if names}
         sorted_categories = sorted(categories.keys())
-        for category in sorted_categories:
-            categories[category].sort(key=lambda x: x["stars"], reverse=True)
-
-        # Build README content
-        readme_content = "# My Awesome List [![Awesome](https://cdn.rawgit.com/sindresorhus/awesome/d7305f38d29fed78fa85652e3a63e154dd8e8829/media/badge.svg)](https://github.com/sindresorhus/awesome)\n\n"
-        readme_content += "> A curated list of my GitHub stars, automatically organized and described by AI\n\n"
-        readme_content += f"*Last updated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')} | Total repos: {len(cache)}*\n\n"
-
-        # Table of contents
-        readme_content += "## Contents\n\n"
-        for category in sorted_categories:
-            anchor = category.lower().replace(" ", "-").replace("/", "").replace("&", "")
-            readme_content += f"- [{category}](#user-content-{anchor}) ({len(categories[category])})\n"
-        readme_content += "\n---\n\n"
-
-        # Generate category sections
-        for category in sorted_categories:
-            readme_content += f"## {category}\n\n"
-            for repo in categories[category]:
-                repo_name = repo["name"].split("/")[1]  # Get just the repo name, not owner/repo
-                language = f" `{repo['language']}`" if repo['language'] else ""
-                stars = f"⭐ {repo['stars']}" if repo['stars'] > 0 else ""
-                readme_content += f"- **[{repo_name}]({repo['url']})** - {repo['description']}{language} {stars}\n"
-            readme_content += "\n"
-
-        readme_content += "---\n\n"
-        readme_content += "*Generated automatically by [MyAwsomeList](https://github.com/felixscode/MyAwsomeList) using Claude API read SETUP.md to learn more*\n"
-
-        # Write to file
-        with open(self.readme_file, 'w') as f:
-            f.write(readme_content)
+
+        # Stream the README straight to disk instead of building it in memory
+        with open(self.readme_file, 'w', buffering=README_WRITE_BUFFER) as f:
+            f.write("# My Awesome List [![Awesome](https://cdn.rawgit.com/sindresorhus/awesome/d7305f38d29fed78fa85652e3a63e154dd8e8829/media/badge.svg)](https://github.com/sindresorhus/awesome)\n\n")
+            f.write("> A curated list of my GitHub stars, automatically organized and described by AI\n\n")
+            f.write(f"*Last updated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')} | Total repos: {len(cache)}*\n\n")
+
+            # Table of contents
+            f.write("## Contents\n\n")
+            f.writelines(
+                f"- [{category}](#user-content-{category.lower().translate(_ANCHOR_TABLE)}) ({len(categories[category])})\n"
+                for category in sorted_categories
+            )
+            f.write("\n---\n\n")
+
+            # Generate category sections
+            for category in sorted_categories:
+                f.write(f"## {category}\n\n")
+                names = categories[category]
+                if self.top_per_category:
+                    names = names[:self.top_per_category]
+                f.writelines(self._readme_line(name, cache[name]) for name in names)
+                f.write("\n")
+
+            f.write("---\n\n")
+            f.write("*Generated automatically by [MyAwsomeList](https://github.com/felixscode/MyAwsomeList) using Claude API read SETUP.md to learn more*\n")
 
         if self.dry_run:
             print(f"[DRY RUN] {self.readme_file} generated with {len(sorted_categories)} categories")
@@ -305,6 +912,8 @@ Respond ONLY with valid JSON in this exact format:
         else:
             print(f"README.md generated with {len(sorted_categories)} categories")
 
+        self.save_index()
+
     def run(self):
         """Main execution flow."""
         print("=" * 60)
@@ -314,9 +923,13 @@ Respond ONLY with valid JSON in this exact format:
         # Load existing cache
         cache = self.load_cache()
         print(f"Loaded cache with {len(cache)} existing entries")
+        if not self.dry_run:
+            self._open_cache_for_append()
+
+        self.load_index(cache)
 
-        # Load predefined categories (REQUIRED for consistent categorization)
-        predefined_categories = self.load_categories()
+        # Predefined categories (REQUIRED for consistent categorization) are loaded in __init__
+        predefined_categories = self.predefined_categories
         if predefined_categories:
             num_cats = len(predefined_categories.get('categories', []))
             print(f"✓ Loaded {num_cats} predefined categories from {self.categories_file}")
@@ -328,15 +941,18 @@ Respond ONLY with valid JSON in this exact format:
             print(f"  The LLM will create categories dynamically (may result in many categories)")
             print(f"  Recommended: Copy .categories.example to .categories and customize it")
 
-        # Fetch all stars from GitHub
-        stars = self.fetch_github_stars()
+        # Fetch all stars from GitHub, skipping pages unchanged since the last run
+        self.etags = self.load_etags(cache)
 
-        # Process new stars
-        cache = self.process_new_stars(stars, cache, predefined_categories)
+        star_pages = self.iter_github_stars()
+
+        # Process new stars as their pages arrive
+        cache = self.process_new_stars(star_pages, cache)
 
         # Save updated cache
         self.save_cache(cache)
         print(f"Cache saved with {len(cache)} total entries")
+        self.save_etags(cache)
 
         # Generate README
         self.generate_readme(cache)
@@ -366,6 +982,12 @@ Examples:
   # Dry run with limit (process only first 3 new repos)
   python generate_awesome_list.py --dry-run --limit 3
 
+  # Categorize with concurrent API calls instead of the batch API
+  python generate_awesome_list.py --llm-mode async
+
+  # Only list the 20 most-starred repos of each category
+  python generate_awesome_list.py --top-per-category 20
+
   # Verbose dry run
   python generate_awesome_list.py --dry-run --verbose
         """
@@ -384,6 +1006,22 @@ Examples:
         help="Limit processing to N new repositories (useful with --dry-run for testing)"
     )
 
+    parser.add_argument(
+        "--llm-mode",
+        choices=LLM_MODES,
+        default="batch",
+        help="How new repositories are sent to Claude: one Message Batches request (cheaper), "
+             "concurrent async API calls (faster for a handful of repos) or rate-limited "
+             "sync API calls on a thread pool. Default: batch"
+    )
+
+    parser.add_argument(
+        "--top-per-category",
+        type=_positive_int,
+        metavar="N",
+        help="Only list the N most-starred repositories in each category of the README"
+    )
+
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -393,7 +1031,8 @@ Examples:
     args = parser.parse_args()
 
     try:
-        generator = AwesomeListGenerator(dry_run=args.dry_run, limit=args.limit)
+        generator = AwesomeListGenerator(dry_run=args.dry_run, limit=args.limit, llm_mode=args.llm_mode,
+                                         top_per_category=args.top_per_category)
         generator.run()
     except KeyboardInterrupt:
         print("\n\n❌ Interrupted by user")